@@ -1,4 +1,7 @@
+import copy
+import functools
 import logging
+import os
 
 import InfoList
 import ParserUtil
@@ -40,6 +43,23 @@ def parse_aips_config(aips_cfg_file):
     dict
         A dictionary of AIPS configuration options
     """
+    # Key the cache on the file's absolute path, so that relative
+    # paths don't go stale on a change of working directory,
+    # and on its modification time and size,
+    # so that changes to the file are parsed again
+    aips_cfg_file = os.path.abspath(aips_cfg_file)
+    st = os.stat(aips_cfg_file)
+    cfg = _parse_aips_config(aips_cfg_file, st.st_mtime_ns, st.st_size)
+    # Don't let callers modify the cached configuration
+    return copy.deepcopy(cfg)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_aips_config(aips_cfg_file, mtime, size):
+    """
+    Parses an AIPS config file. Cached on the
+    file's absolute path, modification time and size.
+    """
     err = obit_err()
     info_list = InfoList.InfoList()
     ParserUtil.PParse(aips_cfg_file, info_list, err)
@@ -88,7 +108,7 @@ def obit_config_from_aips(aips_cfg_file):
         if is_str:
             value = [enum.coerce(v).ljust(dims[0], ' ') for v in value]
         else:
-            value = [enum.coerce(v) for v in value]
+            value = list(map(enum.coerce, value))
 
         # Check second dimension to test singletons
         # if we're handling strings else the first dim
@@ -3,7 +3,32 @@ import inspect
 
 from katacomb import obit_err, handle_obit_err
 
-_VALID_DISK_TYPES = ["AIPS", "FITS"]
+_VALID_DISK_TYPES = frozenset(("AIPS", "FITS"))
+
+# AIPS user number of the current Obit context
+_AIPS_USER = None
+
+
+def _aips_user():
+    """
+    Returns the AIPS user number, which is fixed for the
+    lifetime of an Obit context. Obit is only queried once.
+    """
+    global _AIPS_USER
+
+    user = _AIPS_USER
+
+    if user is None:
+        from OSystem import PGetAIPSuser
+        user = _AIPS_USER = PGetAIPSuser()
+
+    return user
+
+
+def _reset_aips_user():
+    """ Forget the cached AIPS user number """
+    global _AIPS_USER
+    _AIPS_USER = None
 
 
 def next_seq_nr(aips_path):
@@ -22,10 +47,9 @@ def next_seq_nr(aips_path):
         Highest sequence number
     """
     from AIPSDir import PHiSeq, PTestCNO
-    from OSystem import PGetAIPSuser
 
     err = obit_err()
-    aips_user = PGetAIPSuser()
+    aips_user = _aips_user()
 
     hi_seq = PHiSeq(Aname=aips_path.name, user=aips_user,
                     disk=aips_path.disk, Aclass=aips_path.aclass,
@@ -46,37 +70,31 @@ def next_seq_nr(aips_path):
         hi_seq += 1
 
 
-def _check_disk_type(dtype, check=True):
+def _invalid_disk_type(dtype):
     """
-    Checks that `dtype` is either "AIPS" or FITS",
-    raising a `ValueError` if this is not the case.
+    Returns a `ValueError` describing an invalid disk type,
+    for raising by the caller.
 
     Parameters
     ----------
     dtype: string
         AIPS disk type
-    check: boolean
-        False to avoid the check and raise ValueError anyway
 
-    Raises
-    ------
+    Returns
+    -------
     ValueError
-        Raised if `dtype` is not "AIPS" or "FITS"
-        or if check is `False`
+        Exception stating that `dtype` is not "AIPS" or "FITS"
     """
-    if not check or dtype not in _VALID_DISK_TYPES:
-        raise ValueError("Invalid disk type '%s'. "
-                         "Should be one of '%s'" % (
-                             dtype, _VALID_DISK_TYPES))
+    return ValueError(f"Invalid disk type '{dtype}'. "
+                      f"Should be one of '{sorted(_VALID_DISK_TYPES)}'")
 
 
 def path_exists(aips_path):
     """Check if a given AIPS path exists on disk"""
     from AIPSDir import PTestCNO
-    from OSystem import PGetAIPSuser
 
     err = obit_err()
-    aips_user = PGetAIPSuser()
+    aips_user = _aips_user()
     cno = PTestCNO(disk=aips_path.disk, user=aips_user,
                    Aname=aips_path.name, Aclass=aips_path.aclass,
                    Atype=aips_path.atype, seq=aips_path.seq, err=err)
@@ -99,6 +117,8 @@ class AIPSPath(object):
     or sequences, these are defaulted to "fits" and 1, respectively.
     """
 
+    __slots__ = ("name", "disk", "aclass", "seq", "label", "atype", "dtype")
+
     def __init__(self, name, disk=1, aclass="aips",
                  seq=1, atype="UV",
                  label="katuv", dtype="AIPS"):
@@ -125,6 +145,14 @@ class AIPSPath(object):
             Defaults to "AIPS" if not provided.
 
         """
+        if dtype == "FITS":
+            # FITS file don't have class or sequences,
+            # just provide something sensible
+            aclass = "fits"
+            seq = 1
+        elif dtype != "AIPS":
+            raise _invalid_disk_type(dtype)
+
         self.name = name
         self.disk = disk
         self.aclass = aclass
@@ -133,22 +161,25 @@ class AIPSPath(object):
         self.atype = atype
         self.dtype = dtype
 
-        if dtype == "AIPS":
-            pass
-        elif dtype == "FITS":
-            # FITS file don't have class or sequences,
-            # just provide something sensible
-            self.aclass = "fits"
-            self.seq = 1
-        else:
-            _check_disk_type(dtype, False)
-
     def copy(self, name=None, disk=None, aclass=None,
              seq=None, atype=None, label=None, dtype=None):
         """
         Returns a copy of this object. Supplied parameters can
         override properties transferred to the new object.
         """
+        # An AIPS path keeping its disk type needs no normalisation
+        # or validation, so assign the attributes directly
+        if dtype is None and self.dtype == "AIPS":
+            path = object.__new__(AIPSPath)
+            path.name = self.name if name is None else name
+            path.disk = self.disk if disk is None else disk
+            path.aclass = self.aclass if aclass is None else aclass
+            path.seq = self.seq if seq is None else seq
+            path.atype = self.atype if atype is None else atype
+            path.label = self.label if label is None else label
+            path.dtype = self.dtype
+            return path
+
         return AIPSPath(name=self.name if name is None else name,
                         disk=self.disk if disk is None else disk,
                         aclass=self.aclass if aclass is None else aclass,
@@ -159,13 +190,12 @@ class AIPSPath(object):
 
     def __str__(self):
         """ String representation """
-        if self.dtype == "AIPS":
-            return "%s.%s.%s.%s on AIPS %d" % (self.name, self.aclass,
-                                               self.atype, self.seq, self.disk)
-        elif self.dtype == "FITS":
-            return "%s.%s on FITS %d" % (self.name, self.atype, self.disk)
-        else:
-            _check_disk_type(self.dtype, False)
+        try:
+            fmt = _STR_FORMATTERS[self.dtype]
+        except KeyError:
+            raise _invalid_disk_type(self.dtype) from None
+
+        return fmt(self)
 
     __repr__ = __str__
 
@@ -177,17 +207,12 @@ class AIPSPath(object):
             Keyword arguments suitable for applying
             to an ObitTask as an input file.
         """
-        if self.dtype == "AIPS":
-            return {"DataType": self.dtype,
-                    "inName": self.name,
-                    "inClass": self.aclass,
-                    "inSeq": self.seq,
-                    "inDisk": self.disk}
-        elif self.dtype == "FITS":
-            return {"DataType": self.dtype,
-                    "inFile": self.name}
-        else:
-            _check_disk_type(self.dtype, False)
+        try:
+            build = _INPUT_KWARGS[self.dtype]
+        except KeyError:
+            raise _invalid_disk_type(self.dtype) from None
+
+        return build(self)
 
     def task_output_kwargs(self, name=None, disk=None, aclass=None,
                            seq=None, dtype=None):
@@ -200,17 +225,12 @@ class AIPSPath(object):
         """
         dtype = self.dtype if dtype is None else dtype
 
-        if dtype == "AIPS":
-            return {"outDType": dtype,
-                    "outName": self.name if name is None else name,
-                    "outClass": self.aclass if aclass is None else aclass,
-                    "outSeq": self.seq if seq is None else seq,
-                    "outDisk": self.disk if disk is None else disk}
-        elif dtype == "FITS":
-            return {"outDType": dtype,
-                    "outFile": self.name}
-        else:
-            _check_disk_type(dtype, False)
+        try:
+            build = _OUTPUT_KWARGS[dtype]
+        except KeyError:
+            raise _invalid_disk_type(dtype) from None
+
+        return build(self, name, disk, aclass, seq, dtype)
 
     def task_output2_kwargs(self, name=None, disk=None, aclass=None,
                             seq=None, dtype=None):
@@ -223,17 +243,66 @@ class AIPSPath(object):
         """
         dtype = self.dtype if dtype is None else dtype
 
-        # NB. There doesn't seem to be an out2DType
+        try:
+            build = _OUTPUT2_KWARGS[dtype]
+        except KeyError:
+            raise _invalid_disk_type(dtype) from None
 
-        if dtype == "AIPS":
-            return {"out2Name": self.name if name is None else name,
-                    "out2Class": self.aclass if aclass is None else aclass,
-                    "out2Seq": self.seq if seq is None else seq,
-                    "out2Disk": self.disk if disk is None else disk}
-        elif dtype == "FITS":
-            return {"out2File": self.name}
-        else:
-            _check_disk_type(dtype, False)
+        return build(self, name, disk, aclass, seq)
+
+
+def _aips_str(path):
+    return f"{path.name}.{path.aclass}.{path.atype}.{path.seq} on AIPS {int(path.disk)}"
+
+
+def _fits_str(path):
+    return f"{path.name}.{path.atype} on FITS {int(path.disk)}"
+
+
+def _aips_input_kwargs(path):
+    return {"DataType": path.dtype,
+            "inName": path.name,
+            "inClass": path.aclass,
+            "inSeq": path.seq,
+            "inDisk": path.disk}
+
+
+def _fits_input_kwargs(path):
+    return {"DataType": path.dtype,
+            "inFile": path.name}
+
+
+def _aips_output_kwargs(path, name, disk, aclass, seq, dtype):
+    return {"outDType": dtype,
+            "outName": path.name if name is None else name,
+            "outClass": path.aclass if aclass is None else aclass,
+            "outSeq": path.seq if seq is None else seq,
+            "outDisk": path.disk if disk is None else disk}
+
+
+def _fits_output_kwargs(path, name, disk, aclass, seq, dtype):
+    return {"outDType": dtype,
+            "outFile": path.name}
+
+
+# NB. There doesn't seem to be an out2DType
+
+def _aips_output2_kwargs(path, name, disk, aclass, seq):
+    return {"out2Name": path.name if name is None else name,
+            "out2Class": path.aclass if aclass is None else aclass,
+            "out2Seq": path.seq if seq is None else seq,
+            "out2Disk": path.disk if disk is None else disk}
+
+
+def _fits_output2_kwargs(path, name, disk, aclass, seq):
+    return {"out2File": path.name}
+
+
+# Disk type specific implementations of AIPSPath methods
+_STR_FORMATTERS = {"AIPS": _aips_str, "FITS": _fits_str}
+_INPUT_KWARGS = {"AIPS": _aips_input_kwargs, "FITS": _fits_input_kwargs}
+_OUTPUT_KWARGS = {"AIPS": _aips_output_kwargs, "FITS": _fits_output_kwargs}
+_OUTPUT2_KWARGS = {"AIPS": _aips_output2_kwargs, "FITS": _fits_output2_kwargs}
 
 
 _AIPS_PATH_TUPLE_ARGS = [a for a in inspect.getfullargspec(AIPSPath.__init__).args
@@ -1,5 +1,5 @@
 import attr
-import collections
+import collections.abc
 import logging
 
 import History
@@ -20,19 +20,14 @@ log = logging.getLogger('katacomb')
 
 def _scalarise(value):
     """ Converts length 1 lists to singletons """
-    if isinstance(value, list) and len(value) == 1:
+    if type(value) is list and len(value) == 1:
         return value[0]
     return value
 
 
-def _vectorise(value):
-    """ Converts singletons to length 1 lists """
-    if not isinstance(value, list):
-        return [value]
-    return value
-
-
 class AIPSTableKeywords(object):
+    __slots__ = ("_dirty", "_table", "_tabname", "_schema")
+
     def __init__(self, table, table_name):
         """
         Constructs an :class:`AIPSTableKeywords` object.
@@ -51,18 +46,25 @@ class AIPSTableKeywords(object):
         self._dirty = False
         self._table = table
         self._tabname = table_name
-        self._schema = {key: (type_, dims) for
-                        key, (type_, dims, value) in
+        # Type, dimensions, coercion function and
+        # string padding length (None for non-strings) of each keyword
+        self._schema = {key: (type_, dims, OBIT_TYPE_ENUM[type_].coerce,
+                              dims[0] if type_ == OBIT_TYPE.string else None)
+                        for key, (type_, dims, value) in
                         table.Desc.List.Dict.items()}
 
     def keys(self):
         return self._schema.keys()
 
     def values(self):
-        return iter(self.__getitem__(key) for key in self.keys())
+        # Read all keywords in a single descriptor round trip
+        # rather than calling PGet per keyword
+        return iter(_scalarise(value) for type_, dims, value
+                    in self._table.Desc.List.Dict.values())
 
     def items(self):
-        return iter((k, self.__getitem__(k)) for k in self.keys())
+        return iter((key, _scalarise(value)) for key, (type_, dims, value)
+                    in self._table.Desc.List.Dict.items())
 
     def __len__(self):
         return len(self._schema)
@@ -86,8 +88,9 @@ class AIPSTableKeywords(object):
         """
 
         # Return value out of (code, name, type, dims, value) tuple
-        # returned by PGet
-        return _scalarise(InfoList.PGet(self._table.Desc.List, key)[4])
+        # returned by PGet, converting length 1 lists to singletons
+        value = InfoList.PGet(self._table.Desc.List, key)[4]
+        return value[0] if type(value) is list and len(value) == 1 else value
 
     def __setitem__(self, key, value):
         """
@@ -101,11 +104,31 @@ class AIPSTableKeywords(object):
         value:
             value
         """
+        InfoList.PSetDict(self._table.Desc.List,
+                          {key: self._infolist_entry(key, value)})
+
+        self._dirty = True
+
+    def _infolist_entry(self, key, value):
+        """
+        Coerce ``value`` into an InfoList entry for keyword ``key``.
+
+        Parameter
+        ---------
+        key: string
+            Keyword
+        value:
+            value
 
+        Returns
+        -------
+        list
+            [type, dims, value] InfoList entry
+        """
         try:
             # Look up the type and dimensionality associated
             # with this key value pair
-            type_, dims = self._schema[key]
+            type_, dims, coerce, pad = self._schema[key]
         except KeyError:
             raise ValueError("'%s' is not a valid keyword "
                              "for table '%s' ."
@@ -113,20 +136,16 @@ class AIPSTableKeywords(object):
                                  key, self._tabname, list(self._schema.keys())))
 
         # Convert value into a list
-        value = _vectorise(value)
-
-        enum = OBIT_TYPE_ENUM[type_]
+        if type(value) is not list:
+            value = [value]
 
         # Coerce types, being sure to pad strings to their full length
-        if type_ == OBIT_TYPE.string:
-            value = [enum.coerce(v).ljust(dims[0], ' ') for v in value]
+        if pad is None:
+            value = list(map(coerce, value))
         else:
-            value = [enum.coerce(v) for v in value]
-
-        InfoList.PSetDict(self._table.Desc.List,
-                          {key: [type_, dims, value]})
+            value = [coerce(v).ljust(pad, ' ') for v in value]
 
-        self._dirty = True
+        return [type_, dims, value]
 
     def update(self, other=None, **kwargs):
         """
@@ -140,13 +159,21 @@ class AIPSTableKeywords(object):
         **kwargs (optional):
             key values to set.
         """
+        entries = {}
+
         if other is not None:
             is_map = isinstance(other, collections.abc.Mapping)
             for k, v in other.items() if is_map else other:
-                self.__setitem__(k, v)
+                entries[k] = self._infolist_entry(k, v)
+
+        if kwargs:
+            for k, v in kwargs.items():
+                entries[k] = self._infolist_entry(k, v)
 
-        for k, v in kwargs.items():
-            self.__setitem__(k, v)
+        # Set all keywords at once
+        if entries:
+            InfoList.PSetDict(self._table.Desc.List, entries)
+            self._dirty = True
 
     def __pretty__(self, p, cycle):
         """ Pretty print this keyword object """
@@ -174,150 +201,65 @@ AIPSTableField = attr.make_class("AIPSTableField",
                                  frozen=True, slots=True)
 
 
-def _default_row_base(row_def, row):
+def _default_row_template(row_def):
     """
-    Returns default row definition updated
-    with the contents of `row`.
+    Returns a template of default row values
+    from a row definition.
 
     Parameters
     ----------
     row_def: dict
         Definition for the row
-    row: dict
-        Dictionary describing the row
 
     Returns
     -------
     dict
-        default dictionary updated with
-        the contents of `row`
+        { field_name: default value } dictionary
     """
     SPECIALS = ["Table name", "NumFields", "_status"]
-    base_row = {key: item if key in SPECIALS else item[-1]
-                for key, item in row_def.items()}
-    base_row.update(row)
-    return base_row
-
-
-class AIPSTableRow(object):
-    def __init__(self, table, row_nr, row_def, err, row=None):
-        """
-        Creates a :class:`AIPSTableRow`.
-
-        It behaves like a dictionary.
-
-        table: :class:`Table`
-            An Obit table object
-        rownr: integer
-            Number of this row within the AIPS table
-        row_def: dict
-            Dictionary defining the type, shape and defaults
-            of this row.
-        err: :class:`OErr`
-            An Obit error object
-        row (optional): dict
-            If supplied this will be used to define the row,
-            rather than loading the row from the Obit table object.
-        """
-
-        self._table = table
-        self._rownr = row_nr
-        self._row_def = row_def
-        self._err = err
-        self._row = None if row is None else _default_row_base(row_def, row)
-
-    def read(self):
-        """ Reads the appropriate row of the AIPS Table """
-        self._row = self._table.ReadRow(self._rownr, self._err)
-        handle_obit_err("Error loading row '%s'" % self._rownr, self._err)
-
-    def write(self):
-        """ Writes the appropriate row of the AIPS Table """
-        if self._row is None:
-            return
-
-        self._table.WriteRow(self._rownr, self._row, self._err)
-        handle_obit_err("Error writing row '%s'" % self._rownr, self._err)
-
-    def __pretty__(self, p, cycle):
-        """ Pretty print this row """
-        if cycle:
-            p.text("{...}")
-            return
-
-        if self._row is None:
-            self.read()
-
-        p.pretty(self._row)
+    return {key: item if key in SPECIALS else item[-1]
+            for key, item in row_def.items()}
 
-    def asdict(self):
-        if self._row is None:
-            self.read()
 
-        return self._row
-
-    def __getitem__(self, key):
-        """
-        Parameters
-        ----------
-        key: string
-            Row key to return
-
-        Returns
-        -------
-        value associated with `key` in this row
-        """
-
-        if self._row is None:
-            self.read()
-
-        return _scalarise(self._row[key])
-
-    def __setitem__(self, key, value):
-        """
-        Parameters
-        ----------
-        key: string
-            Row key to set
-        value:
-            value to set in this row
-        """
-
-        if self._row is None:
-            self.read()
-
-        try:
-            type_, dims, defaults = self._row_def[key]
-        except KeyError:
-            raise ValueError("'%s' does not appear to be a "
-                             "valid row key. Valid keys "
-                             "include '%s'" % (key, list(self._row_def.keys())))
-
-        # Pad string values appropriately
-        if type_ == OBIT_TYPE.string:
-            value = value.ljust(dims[0], ' ')
+def _default_row_base(row_template, row):
+    """
+    Returns default row values updated
+    with the contents of `row`.
 
-        self._row[key] = _vectorise(value)
+    Default list values are copied so that
+    rows never share them with the template.
 
-    def __len__(self):
-        """ Returns the number of elements in the row """
-        return len(self._row)
+    Parameters
+    ----------
+    row_template: dict
+        Default row values produced by :func:`_default_row_template`
+    row: dict
+        Dictionary describing the row
 
-    def __str__(self):
-        """ Returns a string representation of the row """
-        if self._row is None:
-            self.read()
-        return str(self._row)
+    Returns
+    -------
+    dict
+        default dictionary updated with
+        the contents of `row`
+    """
+    base_row = {key: row[key] if key in row else
+                list(value) if isinstance(value, list) else value
+                for key, value in row_template.items()}
 
-    __repr__ = __str__
+    # Add any entries of `row` that are not in the template
+    base_row.update((key, value) for key, value in row.items()
+                    if key not in row_template)
+    return base_row
 
 
 class AIPSTableRows(object):
+    __slots__ = ("_rows", "_table", "_row_template", "_err")
+
     def __init__(self, table, nrow, row_def, err, rows=None):
         """
         Constructs a :class:`AIPSTableRows` object.
 
-        It behaves like a list.
+        It behaves like a list of row dictionaries.
 
         Parameters
         ----------
@@ -334,17 +276,26 @@ class AIPSTableRows(object):
             If present, these will define the table rows.
             If None, table rows will be lazy loaded from disk
         """
-        # No rows provided, lazy loaded from file on first access
-        if rows is None:
-            rows = nrow * [None]
-
-        self._rows = [AIPSTableRow(table, ri + 1, row_def, err, row=row)
-                      for ri, row in zip(range(nrow), rows)]
-
         self._table = table
-        self._row_def = row_def
+        self._row_template = row_template = _default_row_template(row_def)
         self._err = err
 
+        # No rows provided, lazy loaded from file on first access.
+        # Rows are held as plain dictionaries, None if not yet loaded
+        if rows is None:
+            self._rows = nrow * [None]
+        else:
+            self._rows = [_default_row_base(row_template, row)
+                          for _, row in zip(range(nrow), rows)]
+
+    def _read_row(self, index):
+        """ Reads the row at ``index`` from the AIPS Table """
+        rownr = range(len(self._rows))[index] + 1
+        row = self._table.ReadRow(rownr, self._err)
+        handle_obit_err("Error loading row '%s'" % rownr, self._err)
+        self._rows[index] = row
+        return row
+
     def __getitem__(self, index):
         """
         Parameters
@@ -357,7 +308,12 @@ class AIPSTableRows(object):
         dict
             row at the specified index
         """
-        return self._rows[index].asdict()
+        row = self._rows[index]
+
+        if row is None:
+            row = self._read_row(index)
+
+        return row
 
     def __setitem__(self, index, row):
         """
@@ -369,7 +325,7 @@ class AIPSTableRows(object):
             Dictionary describing the row
         """
 
-        self._rows[index] = _default_row_base(self._row_def, row)
+        self._rows[index] = _default_row_base(self._row_template, row)
 
     def __len__(self):
         """ Returns the number of rows """
@@ -377,34 +333,48 @@ class AIPSTableRows(object):
 
     def append(self, row):
         """ Appends a row to this list """
-        obj_row = AIPSTableRow(self._table, len(self) + 1,
-                               self._row_def, self._err,
-                               row=_default_row_base(self._row_def, row))
-        self._rows.append(obj_row)
+        self._rows.append(_default_row_base(self._row_template, row))
 
     def read(self):
         """ Force a read of all rows """
-        for r in self._rows:
-            r.read()
+        rows = self._rows
+        read_row = self._table.ReadRow
+        err = self._err
+
+        for ri in range(len(rows)):
+            rows[ri] = read_row(ri + 1, err)
+            handle_obit_err("Error loading row '%s'" % (ri + 1), err)
 
     def write(self):
-        """ Force a write of all rows """
-        for r in self._rows:
-            r.write()
+        """ Force a write of all loaded rows """
+        # Obit has no multi-row write, so write each row
+        # through locally bound names
+        write_row = self._table.WriteRow
+        err = self._err
+
+        for ri, row in enumerate(self._rows, 1):
+            if row is None:
+                continue
+
+            write_row(ri, row, err)
+            handle_obit_err("Error writing row '%s'" % ri, err)
 
     def __pretty__(self, p, cycle):
         if cycle:
             p.text('[...]')
         else:
-            p.pretty(self._rows)
+            p.pretty([self[ri] for ri in range(len(self))])
 
     def __str__(self):
-        return str(self._rows)
+        return str([self[ri] for ri in range(len(self))])
 
     __repr__ = __str__
 
 
 class AIPSTable(object):
+    __slots__ = ("_err", "_table", "_name", "_version",
+                 "_keywords", "_fields", "_default_row", "_rows")
+
     FIELD_KEYS = ('FieldName', 'FieldUnit',
                   'dim0', 'dim1', 'dim2',
                   'repeat', 'type')
@@ -513,10 +483,9 @@ class AIPSTable(object):
             Field definition dictionary of the form
             { field_name: :class:`AIPSTableField` }
         """
-        return collections.OrderedDict(
-            (n, AIPSTableField(n, u, [d0, d1, d2], r, t)) for
-            n, u, d0, d1, d2, r, t in
-            zip(*(desc[k] for k in cls.FIELD_KEYS)))
+        return {n: AIPSTableField(n, u, [d0, d1, d2], r, t) for
+                n, u, d0, d1, d2, r, t in
+                zip(*(desc[k] for k in cls.FIELD_KEYS))}
 
     @classmethod
     def _get_row_definitions(cls, table_name, fields):
@@ -546,7 +515,7 @@ class AIPSTable(object):
             elif f.type in OBIT_FLOATS:
                 return f.repeat * [0.0]
             elif f.type in OBIT_STRINGS:
-                return [f.repeat * ' ' for _ in range(f.dims[1])]
+                return f.dims[1] * [f.repeat * ' ']
             elif f.type in OBIT_BOOLS:
                 return f.repeat * [False]
             else:
@@ -562,7 +531,6 @@ class AIPSTable(object):
         # This works and is pretty hacky since these aren't
         # technically fields, but they're needed
         # for a row definition.
-        # TODO: Move this into AIPSTableRow
         defaults.update({"Table name": table_name,
                          "NumFields": len(fields),
                          "_status": [0]})
@@ -42,7 +42,10 @@ def config_validator():
 
 
 __cfg_lock = threading.Lock()
-__default_cfg = config_validator().validated({})
+# Validators hold per-document state, so this one
+# should only be used while holding __cfg_lock
+__cfg_validator = config_validator()
+__default_cfg = __cfg_validator.validated({})
 __active_cfg = __default_cfg.copy()
 
 
@@ -56,7 +59,7 @@ def set_config(cfg={}, **kwargs):
         __active_cfg = __default_cfg.copy()
         recursive_merge(cfg, __active_cfg)
         recursive_merge(kwargs, __active_cfg)
-        __active_cfg = config_validator().validated(__active_cfg)
+        __active_cfg = __cfg_validator.validated(__active_cfg)
 
 
 def get_config():
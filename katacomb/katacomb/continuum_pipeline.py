@@ -472,23 +472,25 @@ class KatdalPipelineImplementation(PipelineImplementation):
 
             nx_row['START VIS'] = [merge_firstVis]
 
+            # Length of a visibility record
+            lrec = merge_uvf.Desc.Dict['lrec']
+            blavg_visbuf = blavg_uvf.np_visbuf
+            merge_visbuf = merge_uvf.np_visbuf
+
             for blavg_firstVis in range(1, blavg_nvis+1, self.nvispio):
                 # How many visibilities do we write in this iteration?
                 numVisBuff = min(blavg_nvis+1 - blavg_firstVis, self.nvispio)
 
-                # Update read file descriptor
-                blavg_desc = blavg_uvf.Desc.Dict
-                blavg_desc.update(numVisBuff=numVisBuff)
-                blavg_uvf.Desc.Dict = blavg_desc
-
-                # Update write file descriptor
-                merge_desc = merge_uvf.Desc.Dict
-                merge_desc.update(numVisBuff=numVisBuff)
-                merge_uvf.Desc.Dict = merge_desc
+                # Update read and write file descriptors.
+                # The write descriptor only changes
+                # for the final, partial buffer
+                blavg_uvf.set_numvisbuff(numVisBuff)
+                merge_uvf.set_numvisbuff(numVisBuff)
 
                 # Read, copy, write
                 blavg_uvf.Read(firstVis=blavg_firstVis)
-                merge_uvf.np_visbuf[:] = blavg_uvf.np_visbuf
+                nfloats = numVisBuff * lrec
+                merge_visbuf[:nfloats] = blavg_visbuf[:nfloats]
                 merge_uvf.Write(firstVis=merge_firstVis)
 
                 # Update merge visibility
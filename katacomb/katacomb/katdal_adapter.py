@@ -1,4 +1,5 @@
-from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+import calendar
 import datetime
 import logging
 import time
@@ -19,6 +20,8 @@ log = logging.getLogger('katacomb')
 
 ONE_DAY_IN_SECONDS = 24*60*60.0
 MAX_AIPS_PATH_LEN = 12
+# Name prefix of threads reading katdal data in the background
+READ_THREAD_PREFIX = 'katdal-read'
 LIGHTSPEED = 299792458.0
 
 """ Map correlation characters to correlation id """
@@ -232,24 +235,24 @@ def aips_catalogue(katdata, nif):
     """
     catalogue = []
 
-    zero = np.asarray([0.0, 0.0])
+    targets = katdata.catalogue.targets
 
-    used = []
+    # (ntargets, 4) array of RA and Declination, followed
+    # by apparent RA and Declination, for each target.
+    # Nothings have no position!
+    positions = np.zeros((len(targets), 4))
 
-    for aips_i, t in enumerate(katdata.catalogue.targets, 1):
-        # Nothings have no position!
-        if "Nothing" == t.name:
-            radec = zero
-            aradec = zero
-        else:
-            radec = t.radec()
-            aradec = t.apparent_radec()
+    for i, t in enumerate(targets):
+        if "Nothing" != t.name:
+            positions[i, 0:2] = t.radec()
+            positions[i, 2:4] = t.apparent_radec()
+
+    # Convert all positions to degrees at once
+    positions = np.rad2deg(positions)
 
-        # Right Ascension and Declination
-        ra, dec = np.rad2deg(radec)
-        # Apparent position
-        raa, deca = np.rad2deg(aradec)
+    used = []
 
+    for aips_i, (t, (ra, dec, raa, deca)) in enumerate(zip(targets, positions), 1):
         source_name = aips_source_name(t.name, used)
 
         aips_source_data = {
@@ -347,6 +350,43 @@ def aips_catalogue(katdata, nif):
 
 MEERKAT = 'MeerKAT'
 
+# Random parameter key, index and coordinate system
+_RandomParameter = attr.make_class("RandomParameters", ["key", "index", "type"])
+
+
+class _CorrelatorProduct(object):
+    """
+    A katdal correlator product, as returned by
+    :meth:`KatdalAdapter.correlator_products`.
+    """
+    __slots__ = ("ant1", "ant2", "cid")
+
+    def __init__(self, ant1, ant2, cid):
+        self.ant1 = ant1
+        self.ant2 = ant2
+        self.cid = cid
+
+    @property
+    def ant1_ix(self):
+        return katdal_ant_nr(self.ant1.name)
+
+    @property
+    def ant2_ix(self):
+        return katdal_ant_nr(self.ant2.name)
+
+    @property
+    def aips_ant1_ix(self):
+        return aips_ant_nr(self.ant1.name)
+
+    @property
+    def aips_ant2_ix(self):
+        return aips_ant_nr(self.ant2.name)
+
+    @property
+    def aips_bl_ix(self):
+        """ This produces the AIPS baseline index random parameter """
+        return self.aips_ant1_ix * 256.0 + self.aips_ant2_ix
+
 
 class _KatdalTransformer(object):
     """
@@ -411,6 +451,9 @@ class KatdalAdapter(object):
             An opened katdal dataset.
         """
         self._katds = katds
+        # Quantities derived from the dataset and its current
+        # selection. Cleared by select(), so selections
+        # must be made through this adapter.
         self._cache = {}
         self._nif = 1
         self._catalogue = aips_catalogue(katds, self._nif)
@@ -420,14 +463,27 @@ class KatdalAdapter(object):
             Transform katdal visibilities indexed by ``index``
             into AIPS visiblities.
             """
-            if isinstance(self._katds.vis, DaskLazyIndexer):
-                arrays = [self._katds.vis, self._katds.weights, self._katds.flags]
-                vis, weights, flags = [dask_getitem(array.dataset, np.s_[index, :, :])
-                                       for array in arrays]
-            else:
-                vis = da.from_array(self._katds.vis[index])
-                weights = da.from_array(self._katds.weights[index])
-                flags = da.from_array(self._katds.flags[index])
+            if not isinstance(self._katds.vis, DaskLazyIndexer):
+                vis = self._katds.vis[index]
+                weights = self._katds.weights[index]
+                flags = self._katds.flags[index]
+                # Split complex vis dtype into real and imaginary parts
+                vis_dtype = vis.dtype.type(0).real.dtype
+                out_array = np.empty(weights.shape + (3,), dtype=vis_dtype)
+                # Write directly into the output array,
+                # applying flags by negating weights.
+                # Real and imaginary parts are written separately,
+                # as vis need not be contiguous
+                out_array[..., 0] = vis.real
+                out_array[..., 1] = vis.imag
+                out_weights = out_array[..., 2]
+                np.copyto(out_weights, weights)
+                np.copyto(out_weights, -32767.0, where=flags)
+                return out_array
+
+            arrays = [self._katds.vis, self._katds.weights, self._katds.flags]
+            vis, weights, flags = [dask_getitem(array.dataset, np.s_[index, :, :])
+                                   for array in arrays]
             # Apply flags by negating weights
             weights = da.where(flags, -32767.0, weights)
             # Split complex vis dtype into real and imaginary parts
@@ -496,6 +552,40 @@ class KatdalAdapter(object):
         """ W coordinate in seconds """
         return self._w_xformer
 
+    def uv_baseline_uvw(self, bl_products):
+        """
+        Computes AIPS UVW coordinates of the given baselines
+        over all timestamps in the current selection.
+
+        :attr:`katdal.DataSet.u` and friends compute coordinates
+        for every correlation product (repeating each baseline
+        ``nstokes`` times) whenever they are accessed.
+        Here, per-antenna coordinates are differenced
+        once for each baseline instead.
+
+        Parameters
+        ----------
+        bl_products : sequence
+            CorrelatorProduct objects, one per baseline,
+            as returned by :meth:`correlator_products`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            AIPS (u, v, w) coordinates. Each has shape (ntime, nbl)
+        """
+        ant_index = {a.name: i for i, a in enumerate(self._katds.ants)}
+        a1 = np.asarray([ant_index[bp.ant1.name] for bp in bl_products], dtype=np.intp)
+        a2 = np.asarray([ant_index[bp.ant2.name] for bp in bl_products], dtype=np.intp)
+
+        def _baseline_coord(name):
+            # (ntime, nant) per-antenna coordinates
+            coord = np.column_stack([self._katds.sensor['Antennas/%s/%s' % (a.name, name)]
+                                     for a in self._katds.ants])
+            return aips_uvw(coord[:, a1] - coord[:, a2], self.refwave)
+
+        return tuple(_baseline_coord(name) for name in ('u', 'v', 'w'))
+
     def scans(self):
         """
         Generator iterating through scans in an observation.
@@ -548,6 +638,12 @@ class KatdalAdapter(object):
         """
         Proxies :meth:`katdal.select` and adds optional `nif` selection.
 
+        Quantities derived from the selection, such as :attr:`refwave`,
+        :attr:`nstokes` and :meth:`correlator_products`, are cached
+        until the next call to this method. Selections must therefore
+        be made through the adapter, rather than on the underlying
+        :attr:`katdal` dataset, which would leave them stale.
+
         Parameters
         ----------
         nif (optional): int
@@ -557,6 +653,8 @@ class KatdalAdapter(object):
         """
         nif = kwargs.pop('nif', self.nif)
         result = self._katds.select(**kwargs)
+        # Quantities derived from the previous selection are stale
+        self._cache.clear()
         # Make sure any possible new channel range in selection is permitted
         self.nif = nif
         return result
@@ -615,7 +713,10 @@ class KatdalAdapter(object):
 
     @property
     def katdal(self):
-        """ The `katdal.DataSet` adapted by this object """
+        """
+        The `katdal.DataSet` adapted by this object.
+        Select data with :meth:`select` rather than on this dataset.
+        """
         return self._katds
 
     @property
@@ -626,8 +727,14 @@ class KatdalAdapter(object):
         str
             The observation date
         """
+        try:
+            return self._cache['obsdat']
+        except KeyError:
+            pass
+
         start = time.gmtime(self._katds.start_time.secs)
-        return time.strftime('%Y-%m-%d', start)
+        obsdat = self._cache['obsdat'] = time.strftime('%Y-%m-%d', start)
+        return obsdat
 
     @property
     def midnight(self):
@@ -637,7 +744,17 @@ class KatdalAdapter(object):
         float
             Midnight on the observation date in unix seconds
         """
-        return time.mktime(time.strptime(self.obsdat, '%Y-%m-%d'))
+        try:
+            return self._cache['midnight']
+        except KeyError:
+            pass
+
+        # Midnight UTC, rather than in the local timezone as
+        # time.mktime(time.strptime(self.obsdat, ...)) would give
+        start = time.gmtime(self._katds.start_time.secs)
+        midnight = float(calendar.timegm(start[:3] + (0, 0, 0)))
+        self._cache['midnight'] = midnight
+        return midnight
 
     @property
     def today(self):
@@ -669,32 +786,10 @@ class KatdalAdapter(object):
                   ('h','v'): 2,
                   ('v','h'): 3 }
         """
-        class CorrelatorProduct(object):
-            def __init__(self, ant1, ant2, cid):
-                self.ant1 = ant1
-                self.ant2 = ant2
-                self.cid = cid
-
-            @property
-            def ant1_ix(self):
-                return katdal_ant_nr(self.ant1.name)
-
-            @property
-            def ant2_ix(self):
-                return katdal_ant_nr(self.ant2.name)
-
-            @property
-            def aips_ant1_ix(self):
-                return aips_ant_nr(self.ant1.name)
-
-            @property
-            def aips_ant2_ix(self):
-                return aips_ant_nr(self.ant2.name)
-
-            @property
-            def aips_bl_ix(self):
-                """ This produces the AIPS baseline index random parameter """
-                return self.aips_ant1_ix * 256.0 + self.aips_ant2_ix
+        try:
+            return list(self._cache['correlator_products'])
+        except KeyError:
+            pass
 
         # { name : antenna } mapping
         antenna_map = {a.name: a for a in self._katds.ants}
@@ -721,9 +816,38 @@ class KatdalAdapter(object):
             a1 = antenna_map[a1_name]
             a2 = antenna_map[a2_name]
 
-            products.append(CorrelatorProduct(a1, a2, cid))
+            products.append(_CorrelatorProduct(a1, a2, cid))
 
-        return products
+        self._cache['correlator_products'] = products
+        return list(products)
+
+    def correlator_product_indices(self):
+        """
+        Returns
+        -------
+        tuple of np.ndarray
+            (ant1_ix, ant2_ix, cid) integer arrays, each holding
+            the katdal antenna numbers and correlator product id
+            of the products returned by :meth:`correlator_products`.
+        """
+        try:
+            return self._cache['correlator_product_indices']
+        except KeyError:
+            pass
+
+        cp = self.correlator_products()
+        ncp = len(cp)
+
+        indices = (np.fromiter((c.ant1_ix for c in cp), dtype=np.int32, count=ncp),
+                   np.fromiter((c.ant2_ix for c in cp), dtype=np.int32, count=ncp),
+                   np.fromiter((c.cid for c in cp), dtype=np.int32, count=ncp))
+
+        # Callers share the cached arrays
+        for array in indices:
+            array.flags.writeable = False
+
+        self._cache['correlator_product_indices'] = indices
+        return indices
 
     @property
     def nstokes(self):
@@ -736,10 +860,21 @@ class KatdalAdapter(object):
             pair of antenna names in the correlation products.
         """
 
+        try:
+            return self._cache['nstokes']
+        except KeyError:
+            pass
+
         # Count the number of times we see a correlation product
-        counts = Counter((cp.ant1_ix, cp.ant2_ix) for cp
-                         in self.correlator_products())
-        return max(counts.values())
+        a1, a2, _ = self.correlator_product_indices()
+
+        if len(a1) == 0:
+            raise ValueError("No correlator products are selected")
+
+        # Flatten (a1, a2) antenna pairs into a single index
+        counts = np.bincount(a1.astype(np.int64) * (a2.max() + 1) + a2)
+        nstokes = self._cache['nstokes'] = int(counts.max())
+        return nstokes
 
     @property
     def nchan(self):
@@ -830,7 +965,13 @@ class KatdalAdapter(object):
         float
             Reference wavelength in metres
         """
-        return LIGHTSPEED / self.reffreq
+        try:
+            return self._cache['refwave']
+        except KeyError:
+            pass
+
+        refwave = self._cache['refwave'] = LIGHTSPEED / self.reffreq
+        return refwave
 
     @property
     def uv_antenna_keywords(self):
@@ -864,6 +1005,7 @@ class KatdalAdapter(object):
         list
             List of dictionaries describing each antenna.
         """
+        nif = self.nif
 
         return [{
             # MeerKAT antenna information
@@ -875,12 +1017,12 @@ class KatdalAdapter(object):
 
             # Defaults for the rest
             'POLAB': [0.0],
-            'POLCALA': [0.0, 0.0] * self.nif,
-            'POLCALB': [0.0, 0.0] * self.nif,
+            'POLCALA': [0.0, 0.0] * nif,
+            'POLCALB': [0.0, 0.0] * nif,
             'POLTYA': ['X'],
             'POLTYB': ['Y'],
             'STAXOF': [0.0],
-            'BEAMFWHM': [0.0] * self.nif,
+            'BEAMFWHM': [0.0] * nif,
             'ORBPARM': [],
             'MNTSTA': [0]
         } for a in sorted(self._katds.ants)]
@@ -961,17 +1103,19 @@ class KatdalAdapter(object):
         """
 
         spw = self._katds.spectral_windows[self._katds.spw]
-        bandwidth = abs(self.chinc) * self.nchan / self.nif
+        nif = self.nif
+        chinc = self.chinc
+        bandwidth = abs(chinc) * self.nchan / nif
 
         return [{
             # Fill in data from MeerKAT spectral window
             'FRQSEL': [self.frqsel],        # Frequency setup ID
-            'IF FREQ': [if_num * bandwidth for if_num in range(self.nif)],
-            'CH WIDTH': [self.chinc] * self.nif,
+            'IF FREQ': [if_num * bandwidth for if_num in range(nif)],
+            'CH WIDTH': [chinc] * nif,
             # Should be 'BANDCODE' according to AIPS MEMO 117!
             'RXCODE': [spw.band],
-            'SIDEBAND': [spw.sideband] * self.nif,
-            'TOTAL BANDWIDTH': [bandwidth] * self.nif,
+            'SIDEBAND': [spw.sideband] * nif,
+            'TOTAL BANDWIDTH': [bandwidth] * nif,
         }]
 
     def fits_descriptor(self):
@@ -1075,7 +1219,7 @@ class KatdalAdapter(object):
 
         # Random parameter keys, indices and coordinate systems
         # index == -1 indicates its absence in the Visibility Buffer
-        RP = attr.make_class("RandomParameters", ["key", "index", "type"])
+        RP = _RandomParameter
 
         random_parameters = [
             RP('ilocu', 0, 'UU-L-SIN'),  # U Coordinate
@@ -1116,7 +1260,8 @@ def time_chunked_scans(kat_adapter, time_step=4):
     where :code:`si` is the scan index, :code:`state` the state
     of the scan and :code:`source` the AIPS source dictionary.
     :code:`data_gen` is itself a generator that yields
-    :code:`time_step` chunks of the data.
+    :code:`time_step` chunks of the data, reading the next chunk
+    in the background. It is closed when the next scan is requested.
 
     Parameters
     ----------
@@ -1143,22 +1288,19 @@ def time_chunked_scans(kat_adapter, time_step=4):
     nstokes = kat_adapter.nstokes
 
     # Lexicographically sort correlation products on (a1, a2, cid)
-    def sort_fn(x): return (cp[x].ant1_ix, cp[x].ant2_ix, cp[x].cid)
-
-    cp_argsort = np.asarray(sorted(range(len(cp)), key=sort_fn))
-    corr_products = np.asarray([cp[i] for i in cp_argsort])
+    a1, a2, cid = kat_adapter.correlator_product_indices()
+    cp_argsort = np.lexsort((cid, a2, a1))
 
-    # Use first stokes parameter index of each baseline
+    # Take the first stokes parameter of each baseline so
+    # that we don't recompute UVW coordinates for all
+    # correlator products
     bl_argsort = cp_argsort[::nstokes]
+    bl_products = [cp[i] for i in bl_argsort]
+    nbl = len(bl_products)
 
-    # Take baseline products so that we don't recompute
-    # UVW coordinates for all correlator products
-    bl_products = corr_products.reshape(-1, nstokes)[:, 0]
-    nbl, = bl_products.shape
-
-    # AIPS baseline IDs
-    aips_baselines = np.asarray([bp.aips_bl_ix for bp in bl_products],
-                                dtype=np.float32)
+    # AIPS baseline IDs, from the AIPS antenna numbers
+    # of the first stokes parameter of each baseline
+    aips_baselines = ((a1[bl_argsort] + 1) * 256 + a2[bl_argsort] + 1).astype(np.float32)
 
     # Get the AIPS visibility data shape (inaxes)
     # reverse to go from FORTRAN to C ordering
@@ -1169,21 +1311,48 @@ def time_chunked_scans(kat_adapter, time_step=4):
 
     out_vis_size = kat_adapter.uv_vis.dtype.itemsize
     out_vis_shape = (time_step, nbl, nchan, nstokes, 3)
-    vis_size_estimate = np.product(out_vis_shape, dtype=np.int64)*out_vis_size
+    # The reorganised visibilities of the current chunk are held
+    # while the next chunk is read in the background
+    vis_size_estimate = 2 * time_step * nbl * nchan * nstokes * 3 * out_vis_size
 
     EIGHT_GB = 8*1024**3
 
     if vis_size_estimate > EIGHT_GB:
-        log.warning("Visibility chunk '%s' is greater than '%s'. "
+        log.warning("Visibility chunks '%s' (current and read ahead) "
+                    "are greater than '%s'. "
                     "Check that sufficient memory is available",
                     fmt_bytes(vis_size_estimate), fmt_bytes(EIGHT_GB))
 
     # Get some memory to hold reorganised visibilities
     out_vis = np.empty(out_vis_shape, dtype=kat_adapter.uv_vis.dtype)
 
-    def _get_data(time_start, time_end):
+    def _read_data(time_start, time_end):
+        """
+        Read timestamps and visibilities for the given time index range.
+
+        Parameters
+        ----------
+        time_start : integer
+            Start time index for this scan
+        time_end : integer
+            Ending time index for this scan
+
+        Returns
+        -------
+        time : np.ndarray
+            AIPS timestamps
+        vis : np.ndarray
+            AIPS visibilities, ordered as katdal correlation products
+        """
+        # Retrieve scan data (ntime, nchan, nbl*nstokes)
+        # nbl*nstokes is all mixed up at this point
+        aips_time = kat_adapter.uv_timestamps[time_start:time_end]
+        aips_vis = kat_adapter.uv_vis[time_start:time_end]
+        return aips_time, aips_vis
+
+    def _get_data(time_start, time_end, scan_uvw, aips_time, aips_vis):
         """
-        Retrieve data for the given time index range.
+        Organise data for the given time index range.
 
         Parameters
         ----------
@@ -1191,6 +1360,12 @@ def time_chunked_scans(kat_adapter, time_step=4):
             Start time index for this scan
         time_end : integer
             Ending time index for this scan
+        scan_uvw : tuple of np.ndarray
+            AIPS baseline (u, v, w) coordinates of this scan
+        aips_time : np.ndarray
+            AIPS timestamps returned by :func:`_read_data`
+        aips_vis : np.ndarray
+            AIPS visibilities returned by :func:`_read_data`
 
         Returns
         -------
@@ -1209,13 +1384,7 @@ def time_chunked_scans(kat_adapter, time_step=4):
         """
         ntime = time_end - time_start
 
-        # Retrieve scan data (ntime, nchan, nbl*nstokes)
-        # nbl*nstokes is all mixed up at this point
-        aips_time = kat_adapter.uv_timestamps[time_start:time_end]
-        aips_vis = kat_adapter.uv_vis[time_start:time_end]
-        aips_u = kat_adapter.uv_u[time_start:time_end]
-        aips_v = kat_adapter.uv_v[time_start:time_end]
-        aips_w = kat_adapter.uv_w[time_start:time_end]
+        aips_u, aips_v, aips_w = (c[time_start:time_end] for c in scan_uvw)
 
         # Check dimension shapes
         assert aips_vis.dtype == np.float32
@@ -1225,9 +1394,6 @@ def time_chunked_scans(kat_adapter, time_step=4):
         assert aips_w.dtype == np.float64
         assert (ntime,) == aips_time.shape
         assert (ntime, nchan, ncorrprods, 3) == aips_vis.shape
-        assert (ntime, ncorrprods) == aips_u.shape
-        assert (ntime, ncorrprods) == aips_v.shape
-        assert (ntime, ncorrprods) == aips_w.shape
 
         # Reorganise correlation product dim of aips_vis so that
         # correlations are grouped into nstokes per baseline and
@@ -1235,13 +1401,9 @@ def time_chunked_scans(kat_adapter, time_step=4):
         aips_vis = _reorganise_product(aips_vis, cp_argsort.reshape(nbl, nstokes), out_vis[:ntime])
 
         # Reshape to include the full AIPS UV inaxes shape,
-        # including singleton ra and dec dimensions
-        aips_vis.reshape((ntime, nbl,) + inaxes)
-
-        # Select UVW coordinate of each baseline
-        aips_u = aips_u[:, bl_argsort]
-        aips_v = aips_v[:, bl_argsort]
-        aips_w = aips_w[:, bl_argsort]
+        # including singleton ra and dec dimensions.
+        # out_vis is C contiguous so this is a view, not a copy
+        aips_vis = aips_vis.reshape((ntime, nbl,) + inaxes)
 
         assert aips_u.shape == (ntime, nbl)
         assert aips_v.shape == (ntime, nbl)
@@ -1252,17 +1414,64 @@ def time_chunked_scans(kat_adapter, time_step=4):
                 aips_time, aips_baselines,
                 aips_vis)
 
+    def _scan_data(ntime, scan_uvw):
+        """
+        Generator yielding :func:`_get_data` for each time chunk
+        of a scan. The next chunk is read in a background thread
+        while the caller consumes the current chunk, overlapping
+        katdal reads with AIPS writes. Only reads happen in the
+        background thread, so numba kernels are never run concurrently.
+
+        The next read only starts once the current chunk has been
+        reorganised, so that at most one unorganised chunk is held.
+        Closing the generator cancels or waits for any outstanding
+        read, so that none is left running against the adapter.
+        """
+        time_ranges = [(ts, min(ts+time_step, ntime)) for ts
+                       in range(0, ntime, time_step)]
+
+        if len(time_ranges) == 0:
+            return
+
+        with ThreadPoolExecutor(max_workers=1,
+                                thread_name_prefix=READ_THREAD_PREFIX) as executor:
+            future = executor.submit(_read_data, *time_ranges[0])
+
+            try:
+                for i, (ts, te) in enumerate(time_ranges):
+                    aips_time, aips_vis = future.result()
+                    data = _get_data(ts, te, scan_uvw, aips_time, aips_vis)
+                    del aips_time, aips_vis
+
+                    # Start reading the next chunk
+                    if i + 1 < len(time_ranges):
+                        future = executor.submit(_read_data, *time_ranges[i + 1])
+
+                    yield data
+            finally:
+                # Don't leave a read running when the generator is closed
+                future.cancel()
+                wait([future])
+
     # Iterate through scans
     for si, state, target in kat_adapter.scans():
         ntime = kat_adapter.shape[0]
 
+        # Compute UVW coordinates of each baseline once per scan,
+        # rather than for every correlator product in each time chunk
+        scan_uvw = kat_adapter.uv_baseline_uvw(bl_products)
+
         # Create a generator returning data
         # associated with chunks of time data.
-        data_gen = (_get_data(ts, min(ts+time_step, ntime)) for ts
-                    in range(0, ntime, time_step))
+        data_gen = _scan_data(ntime, scan_uvw)
 
-        # Yield scan variables and the generator
-        yield si, state, target, data_gen
+        try:
+            # Yield scan variables and the generator
+            yield si, state, target, data_gen
+        finally:
+            # Wait for any background read before the next scan
+            # changes the selection, or this generator is closed
+            data_gen.close()
 
 
 @numba.jit(nopython=True, parallel=True)
@@ -1296,16 +1505,18 @@ def _reorganise_product(vis, cp_argsort, out_vis):
     n_chan = vis.shape[1]
     n_bl = cp_argsort.shape[0]
     n_stok = cp_argsort.shape[1]
-    for tm in range(n_time):
-        bstep = 128
-        bblocks = (n_bl + bstep - 1) // bstep
-        for bblock in numba.prange(bblocks):
-            bstart = bblock * bstep
-            bstop = min(n_bl, bstart + bstep)
-            for prod in range(bstart, bstop):
-                in_cp = cp_argsort[prod]
-                for stok in range(n_stok):
-                    in_stok = in_cp[stok]
-                    for chan in range(n_chan):
-                        out_vis[tm, prod, chan, stok] = vis[tm, chan, in_stok]
+    bstep = 128
+    bblocks = (n_bl + bstep - 1) // bstep
+    # (time, baseline block) pairs are independent units of work,
+    # so distribute all of them over a single parallel loop
+    for block in numba.prange(n_time * bblocks):
+        tm = block // bblocks
+        bstart = (block % bblocks) * bstep
+        bstop = min(n_bl, bstart + bstep)
+        for prod in range(bstart, bstop):
+            in_cp = cp_argsort[prod]
+            for stok in range(n_stok):
+                in_stok = in_cp[stok]
+                for chan in range(n_chan):
+                    out_vis[tm, prod, chan, stok] = vis[tm, chan, in_stok]
     return out_vis
@@ -56,6 +56,10 @@ class ObitContext(object):
         """
         Shutdown the Obit System, logging any errors on the error stack
         """
+        from katacomb.aips_path import _reset_aips_user
+
+        # The next context may be created with a different AIPS user
+        _reset_aips_user()
 
         # Remove defined AIPS & FITS dirs from environment to prevent
         # overloading the list of defined disks when multiple Obit
@@ -14,7 +14,63 @@ from katacomb import (AIPSPath,
                       obit_context,
                       uv_factory)
 
+from katacomb.aips_table import AIPSTableRows
+from katacomb.obit_types import OBIT_TYPE
 from katacomb.tests.test_aips_path import file_cleaner
+from katacomb.uv_facade import UVFacade
+
+
+class _FakeErr(object):
+    isErr = False
+
+
+class _FakeTable(object):
+    """ Fake Obit table, returning a new dictionary for every row read """
+    def __init__(self, rows):
+        self._rows = rows
+        self.reads = []
+
+    def ReadRow(self, rownr, err):
+        self.reads.append(rownr)
+        return {k: list(v) if isinstance(v, list) else v
+                for k, v in self._rows[rownr - 1].items()}
+
+
+class _FakeDesc(object):
+    """ Fake UV descriptor, counting descriptor writes """
+    def __init__(self):
+        self._dict = {'numVisBuff': 0}
+        self.writes = 0
+
+    @property
+    def Dict(self):
+        return self._dict.copy()
+
+    @Dict.setter
+    def Dict(self, value):
+        self._dict = value.copy()
+        self.writes += 1
+
+
+class _FakeUV(object):
+    """ Fake Obit UV object, changing numVisBuff as Obit does """
+    def __init__(self):
+        self.Desc = _FakeDesc()
+
+    def Open(self, mode, err):
+        self.Desc._dict['numVisBuff'] = 0
+
+    def Read(self, err, firstVis=None):
+        self.Desc._dict['numVisBuff'] = 1
+
+    def Write(self, err, firstVis=None):
+        pass
+
+    def UpdateDesc(self, err):
+        pass
+
+    def Close(self, err):
+        self.Desc._dict['numVisBuff'] = 0
 
 
 class TestAipsFacades(unittest.TestCase):
@@ -115,6 +171,111 @@ class TestAipsFacades(unittest.TestCase):
                     buf_times = buf[iloct:lrec*numVisBuff:lrec]
                     self.assertTrue(np.all(times == buf_times))
 
+    def test_set_numvisbuff(self):
+        """
+        Test that setting numVisBuff skips unchanged values, but
+        not after Obit or the caller may have changed the descriptor
+        """
+        uv = _FakeUV()
+
+        # Wrap the fake UV object without opening it through Obit
+        uvf = UVFacade.__new__(UVFacade)
+        uvf._uv = uv
+        uvf._err = _FakeErr()
+        uvf._aips_path = AIPSPath('test', 1, 'test', 1)
+        uvf._tables = {}
+        uvf._numVisBuff = None
+
+        def _check_set(numVisBuff, round_trip):
+            writes = uv.Desc.writes
+            uvf.set_numvisbuff(numVisBuff)
+            self.assertEqual(uv.Desc.writes, writes + int(round_trip))
+            self.assertEqual(uv.Desc._dict['numVisBuff'], numVisBuff)
+
+        _check_set(20, True)
+        _check_set(20, False)
+        uvf.Write()
+        _check_set(20, False)
+        _check_set(7, True)
+
+        uvf.Open(0)
+        _check_set(7, True)
+
+        uvf.Read()
+        _check_set(7, True)
+
+        uvf.update_descriptor({'nvis': 10})
+        _check_set(7, True)
+
+        # Setting the descriptor directly
+        desc = uvf.Desc.Dict
+        desc['numVisBuff'] = 3
+        uvf.Desc.Dict = desc
+        _check_set(7, True)
+
+        uvf.close()
+        self.assertIsNone(uvf._numVisBuff)
+
+    def test_table_rows(self):
+        """
+        Test that lazily loaded table rows match eagerly loaded rows
+        and that default row values are not shared between rows
+        """
+        row_def = {'Table name': 'AIPS XX',
+                   'NumFields': 2,
+                   '_status': [0],
+                   'TIME': [OBIT_TYPE.double, [1, 1, 1, 1, 1], [0.0]],
+                   'SOURCE': [OBIT_TYPE.string, [4, 1, 1, 1, 1], ['    ']]}
+
+        disk_rows = [{'Table name': 'AIPS XX', 'NumFields': 2, '_status': [0],
+                      'TIME': [float(i)], 'SOURCE': ['s%03d' % i]}
+                     for i in range(5)]
+
+        err = _FakeErr()
+
+        # Read rows on access, out of order and repeatedly
+        lazy_table = _FakeTable(disk_rows)
+        lazy = AIPSTableRows(lazy_table, len(disk_rows), row_def, err)
+        self.assertEqual(lazy_table.reads, [])
+        self.assertEqual(lazy[-1], disk_rows[-1])
+        self.assertEqual(lazy[2], disk_rows[2])
+        self.assertEqual(lazy[2], disk_rows[2])
+        self.assertEqual(lazy_table.reads, [5, 3])
+        lazy_rows = [lazy[i] for i in range(len(lazy))]
+        self.assertEqual(lazy_table.reads, [5, 3, 1, 2, 4])
+
+        # Force a read of all rows
+        eager_table = _FakeTable(disk_rows)
+        eager = AIPSTableRows(eager_table, len(disk_rows), row_def, err)
+        eager.read()
+        self.assertEqual(eager_table.reads, [1, 2, 3, 4, 5])
+        eager_rows = [eager[i] for i in range(len(eager))]
+        self.assertEqual(eager_table.reads, [1, 2, 3, 4, 5])
+
+        self.assertEqual(lazy_rows, eager_rows)
+        self.assertEqual(lazy_rows, disk_rows)
+
+        # Rows created from defaults
+        rows = AIPSTableRows(_FakeTable([]), 2, row_def, err,
+                             rows=[{'SOURCE': ['abcd']}, {'EXTRA': [1]}])
+        rows.append({})
+        rows[0]['TIME'][0] = 5.0
+        rows[1]['SOURCE'][0] = 'efgh'
+
+        self.assertEqual(rows[0]['TIME'], [5.0])
+        self.assertEqual(rows[0]['SOURCE'], ['abcd'])
+        self.assertEqual(rows[1]['TIME'], [0.0])
+        self.assertEqual(rows[1]['SOURCE'], ['efgh'])
+        self.assertEqual(rows[1]['EXTRA'], [1])
+        self.assertEqual(rows[2]['TIME'], [0.0])
+        self.assertEqual(rows[2]['SOURCE'], ['    '])
+        self.assertEqual(row_def['TIME'][2], [0.0])
+        self.assertEqual(row_def['SOURCE'][2], ['    '])
+
+        # Default rows keep the row definition's field order
+        self.assertEqual(list(rows[2].keys()), list(row_def.keys()))
+        self.assertEqual(list(rows[1].keys()), list(row_def.keys()) + ['EXTRA'])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from katacomb.aips_parser import (parse_aips_config,
+                                  obit_config_from_aips,
+                                  _parse_aips_config)
+from katacomb.obit_types import OBIT_TYPE
+
+
+class _FakeInfoList(dict):
+    """ Fake Obit InfoList, holding parsed options """
+    pass
+
+
+def _fake_parse(aips_cfg_file, info_list, err):
+    """
+    Fake :code:`ParserUtil.PParse`, reading
+    :code:`key=value` floating point options.
+    """
+    with open(aips_cfg_file) as f:
+        for line in f:
+            key, value = line.strip().split('=')
+            info_list[key] = [OBIT_TYPE.float, [1, 1, 1, 1, 1], [float(value)]]
+
+
+class TestAipsParser(unittest.TestCase):
+    """
+    Test caching of parsed AIPS configuration files
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cfg_file = os.path.join(self.tmpdir, 'test.in')
+        _parse_aips_config.cache_clear()
+
+        # Substitute Obit's parser with a simple key=value parser
+        fake_infolist = mock.Mock(InfoList=_FakeInfoList, PGetDict=dict)
+        patchers = [mock.patch('katacomb.aips_parser.InfoList', fake_infolist),
+                    mock.patch('katacomb.aips_parser.obit_err'),
+                    mock.patch('katacomb.aips_parser.handle_obit_err')]
+
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        parse_patcher = mock.patch('katacomb.aips_parser.ParserUtil.PParse',
+                                   side_effect=_fake_parse)
+        self.parse = parse_patcher.start()
+        self.addCleanup(parse_patcher.stop)
+
+    def tearDown(self):
+        _parse_aips_config.cache_clear()
+        shutil.rmtree(self.tmpdir)
+
+    def _write_cfg(self, contents, mtime_ns):
+        """ Write the configuration file with the given modification time """
+        with open(self.cfg_file, 'w') as f:
+            f.write(contents)
+
+        os.utime(self.cfg_file, ns=(mtime_ns, mtime_ns))
+
+    def test_file_changes(self):
+        """ Test that modified configuration files are parsed again """
+        mtime_ns = 1500000000 * 10**9
+
+        self._write_cfg("a=1.0\n", mtime_ns)
+        self.assertEqual(obit_config_from_aips(self.cfg_file), {'a': 1.0})
+        self.assertEqual(obit_config_from_aips(self.cfg_file), {'a': 1.0})
+        self.assertEqual(self.parse.call_count, 1)
+
+        # New size and modification time
+        self._write_cfg("a=1.0\nb=2.0\n", mtime_ns + 10**9)
+        self.assertEqual(obit_config_from_aips(self.cfg_file), {'a': 1.0, 'b': 2.0})
+        self.assertEqual(self.parse.call_count, 2)
+
+        # Same size, new modification time
+        self._write_cfg("a=3.0\nb=4.0\n", mtime_ns + 2*10**9)
+        self.assertEqual(obit_config_from_aips(self.cfg_file), {'a': 3.0, 'b': 4.0})
+        self.assertEqual(self.parse.call_count, 3)
+
+        # Same modification time, new size
+        self._write_cfg("a=5.0\n", mtime_ns + 2*10**9)
+        self.assertEqual(obit_config_from_aips(self.cfg_file), {'a': 5.0})
+        self.assertEqual(self.parse.call_count, 4)
+
+    def test_relative_paths(self):
+        """ Test that relative paths are cached on the absolute path """
+        self._write_cfg("a=1.0\n", 1500000000 * 10**9)
+
+        other_dir = os.path.join(self.tmpdir, 'other')
+        os.mkdir(other_dir)
+        other_file = os.path.join(other_dir, 'test.in')
+
+        with open(other_file, 'w') as f:
+            f.write("a=2.0\n")
+
+        # Same size and modification time as the first file
+        os.utime(other_file, ns=(1500000000 * 10**9,) * 2)
+
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        os.chdir(self.tmpdir)
+
+        # Relative and absolute paths share a cache entry
+        self.assertEqual(obit_config_from_aips('test.in'), {'a': 1.0})
+        self.assertEqual(obit_config_from_aips(self.cfg_file), {'a': 1.0})
+        self.assertEqual(self.parse.call_count, 1)
+
+        # The relative path refers to another file in another directory
+        os.chdir(other_dir)
+        self.assertEqual(obit_config_from_aips('test.in'), {'a': 2.0})
+        self.assertEqual(self.parse.call_count, 2)
+
+    def test_returned_config_copied(self):
+        """ Test that modifying a returned configuration doesn't affect the cache """
+        self._write_cfg("a=1.0\n", 1500000000 * 10**9)
+        expected = {'a': [OBIT_TYPE.float, [1, 1, 1, 1, 1], [1.0]]}
+
+        cfg = parse_aips_config(self.cfg_file)
+        self.assertEqual(cfg, expected)
+
+        # Modify nested lists and the dictionary itself
+        cfg['a'][1][0] = 64
+        cfg['a'][2][0] = 99.0
+        cfg['b'] = cfg.pop('a')
+
+        self.assertEqual(parse_aips_config(self.cfg_file), expected)
+        self.assertEqual(obit_config_from_aips(self.cfg_file), {'a': 1.0})
+        self.assertEqual(self.parse.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -72,6 +72,38 @@ class TestAipsPath(unittest.TestCase):
         for i in range(1, len(test_values)):
             _test_wrapper(test_values[0:i])
 
+    def test_copy(self):
+        """ Test that copies match normally constructed AIPS paths """
+        kwargs = {'name': 'test', 'disk': 2, 'aclass': "klass", 'seq': 3,
+                  'atype': "MA", 'label': "alabel"}
+        overrides = {'name': 'other', 'disk': 4, 'aclass': "other", 'seq': 5,
+                     'atype': "UV", 'label': "olabel"}
+
+        p = AIPSPath(**kwargs)
+
+        def _assert_path_equal(path, expected):
+            self.assertIs(type(path), AIPSPath)
+            self.assertEqual({s: getattr(path, s) for s in AIPSPath.__slots__},
+                             {s: getattr(expected, s) for s in AIPSPath.__slots__})
+
+        _assert_path_equal(p.copy(), p)
+
+        for key, value in overrides.items():
+            _assert_path_equal(p.copy(**{key: value}),
+                               AIPSPath(**dict(kwargs, **{key: value})))
+
+        _assert_path_equal(p.copy(**overrides), AIPSPath(**overrides))
+        _assert_path_equal(p.copy(dtype="AIPS"), p)
+
+    def test_str(self):
+        """ Test AIPS path string representations """
+        p = AIPSPath(name='test', disk=2, aclass="klass", seq=3)
+        self.assertEqual(str(p), "test.klass.UV.3 on AIPS 2")
+        self.assertEqual(str(p.copy(disk=2.0)), "test.klass.UV.3 on AIPS 2")
+
+        p = AIPSPath(name='test.uvfits', disk=2.0, dtype="FITS")
+        self.assertEqual(str(p), "test.uvfits.UV on FITS 2")
+
     def test_parse_aips_path_fail(self):
         """ Test for an invalid tuple """
         with self.assertRaises(ValueError) as cm:
@@ -1,4 +1,7 @@
+import os
 import random
+import threading
+import time
 import unittest
 
 from ephem.stars import stars
@@ -17,7 +20,9 @@ from katacomb import (AIPSPath,
                       uv_factory,
                       uv_export)
 
+from katacomb.katdal_adapter import READ_THREAD_PREFIX, time_chunked_scans
 from katacomb.tests.test_aips_path import file_cleaner
+from katacomb.uv_export import _record_packer
 from katacomb.util import parse_python_assigns
 
 
@@ -76,6 +81,158 @@ class TestUVExport(unittest.TestCase):
         self._test_export_implementation("uv_export", nif=4)
         self._test_export_implementation("continuum_export", nif=4)
 
+    def test_midnight_timezone(self):
+        """
+        Test that the observation date and midnight are
+        in UTC, regardless of the local timezone.
+        """
+        # 2017-01-01 23:00:00 UTC, which is already
+        # 2017-01-02 in timezones east of UTC+1
+        start_time = 1483311600.0
+        utc_midnight = 1483228800.0
+
+        targets = [katpoint.Target("Flosshilde, radec, 0.0, -30.0")]
+        timestamps = {'start_time': start_time, 'dump_period': 4.0}
+
+        old_tz = os.environ.get('TZ')
+
+        try:
+            for tz in ('UTC', 'Pacific/Auckland', 'America/Los_Angeles'):
+                os.environ['TZ'] = tz
+                time.tzset()
+
+                ds = MockDataSet(timestamps=timestamps,
+                                 subarrays=DEFAULT_SUBARRAYS,
+                                 dumps=[('track', 2, targets[0])])
+                KA = KatdalAdapter(ds)
+
+                self.assertEqual(KA.obsdat, '2017-01-01')
+                self.assertEqual(KA.midnight, utc_midnight)
+                # First dump is centred 2 seconds after the start time
+                self.assertAlmostEqual(KA.uv_timestamps[0],
+                                       (start_time + 2.0 - utc_midnight) / 86400.0)
+        finally:
+            if old_tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = old_tz
+            time.tzset()
+
+    def test_time_chunked_scans(self):
+        """
+        Test that background reads produce the expected chunks
+        and that closing the generators stops any read.
+        """
+        nchan = 16
+
+        spws = [{
+            'centre_freq': .856e9 + .856e9 / 2.,
+            'num_chans': nchan,
+            'channel_width': .856e9 / nchan,
+            'sideband': 1,
+            'band': 'L',
+        }]
+
+        targets = [katpoint.Target("Flosshilde, radec, 0.0, -30.0"),
+                   katpoint.Target("Woglinde, radec, 20.0, -40.0")]
+
+        scans = [('track', 10, targets[0]),
+                 ('slew', 2, targets[1]),
+                 ('track', 7, targets[1])]
+
+        ds = MockDataSet(timestamps=DEFAULT_TIMESTAMPS,
+                         subarrays=DEFAULT_SUBARRAYS,
+                         spws=spws,
+                         dumps=scans)
+
+        KA = KatdalAdapter(ds)
+        time_step = 3
+
+        def _read_threads():
+            return [t for t in threading.enumerate()
+                    if t.name.startswith(READ_THREAD_PREFIX)]
+
+        for si, state, source, data_gen in time_chunked_scans(KA, time_step):
+            ntime = KA.shape[0]
+            expected_times = KA.uv_timestamps[:]
+            expected_ranges = [(ts, min(ts + time_step, ntime))
+                               for ts in range(0, ntime, time_step)]
+
+            ranges = []
+            time_start = 0
+
+            # Chunks arrive in order, covering the whole scan
+            for u, v, w, aips_time, baselines, vis in data_gen:
+                time_end = time_start + len(aips_time)
+                ranges.append((time_start, time_end))
+                self.assertTrue(np.all(aips_time == expected_times[time_start:time_end]))
+                self.assertEqual(vis.shape[0], len(aips_time))
+                time_start = time_end
+
+            self.assertEqual(ranges, expected_ranges)
+
+        self.assertEqual(_read_threads(), [])
+
+        # Abandon the outer generator after the first chunk of a scan,
+        # while the second chunk is being read in the background
+        scan_gen = time_chunked_scans(KA, time_step)
+        si, state, source, data_gen = next(scan_gen)
+        next(data_gen)
+        scan_gen.close()
+
+        self.assertEqual(_read_threads(), [])
+
+        with self.assertRaises(StopIteration):
+            next(data_gen)
+
+    def test_pack_records(self):
+        """
+        Test that records are packed by kernels specialised
+        on, and cached by, the record layout.
+        """
+        ntime, nbl, nflat = 3, 4, 6
+        rs = np.random.RandomState(42)
+
+        u, v, w = (rs.random_sample((ntime, nbl)) for _ in range(3))
+        time = rs.random_sample(ntime)
+        baselines = rs.random_sample(nbl).astype(np.float32)
+        vis = rs.random_sample((ntime*nbl, nflat)).astype(np.float32)
+
+        kernels = []
+
+        # Random parameter (u, v, w, time, baseline, source) indices of
+        # two different layouts, as exports of different files could have
+        for ilocs in ((0, 1, 2, 3, 4, 5), (5, 4, 3, 2, 1, 0)):
+            nrparm = len(ilocs)
+            lrec = nrparm + nflat
+            pack_records = _record_packer(nrparm, lrec, *ilocs)
+            kernels.append(pack_records)
+
+            # Pack twice, as consecutive exports with this layout would
+            for _ in range(2):
+                records = np.zeros((ntime*nbl - 2, lrec), dtype=np.float32)
+
+                # Pack all but the first two (time, baseline) pairs
+                pack_records(records, 2, u, v, w, time, baselines, 7, vis)
+
+                ilocu, ilocv, ilocw, iloct, ilocb, ilocsu = ilocs
+                t, bl = np.divmod(np.arange(2, ntime*nbl), nbl)
+
+                self.assertTrue(np.all(records[:, ilocu] == u[t, bl].astype(np.float32)))
+                self.assertTrue(np.all(records[:, ilocv] == v[t, bl].astype(np.float32)))
+                self.assertTrue(np.all(records[:, ilocw] == w[t, bl].astype(np.float32)))
+                self.assertTrue(np.all(records[:, iloct] == time[t].astype(np.float32)))
+                self.assertTrue(np.all(records[:, ilocb] == baselines[bl]))
+                self.assertTrue(np.all(records[:, ilocsu] == 7))
+                self.assertTrue(np.all(records[:, nrparm:] == vis[2:]))
+
+            # The same layout reuses the kernel compiled on the first export
+            self.assertIs(_record_packer(nrparm, lrec, *ilocs), pack_records)
+            self.assertEqual(len(pack_records.signatures), 1)
+
+        # Each layout has its own specialised kernel
+        self.assertIsNot(kernels[0], kernels[1])
+
     def test_empty_dataset(self):
         """Test that a completely flagged dataset is exported without error"""
         nchan = 16
@@ -574,7 +574,9 @@ def export_options(parser):
                        default=1024,
                        type=int,
                        help="Number of visibilities per write when copying data "
-                            "from archive. Default: %(default)s")
+                            "from archive. Larger values amortise the cost of each "
+                            "write, but the write buffer holds nvispio full-band "
+                            "visibility records. Default: %(default)s")
     group.add_argument("-ba",
                        "--uvblavg",
                        default="",
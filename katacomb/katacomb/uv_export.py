@@ -1,7 +1,9 @@
+import functools
 import logging
 
 import katdal
 import katpoint
+import numba
 import numpy as np
 
 import OTObit
@@ -11,6 +13,15 @@ from katacomb.util import fmt_bytes
 
 log = logging.getLogger('katacomb')
 
+# AIPS NX table row fields, in AIPS NX table column order
+NX_ROW_DTYPE = np.dtype([('TIME', np.float64),
+                         ('TIME INTERVAL', np.float64),
+                         ('SOURCE ID', np.int32),
+                         ('SUBARRAY', np.int32),
+                         ('FREQ ID', np.int32),
+                         ('START VIS', np.int32),
+                         ('END VIS', np.int32)])
+
 
 def _write_buffer(uvf, firstVis, numVisBuff, lrec):
     """
@@ -37,9 +48,7 @@ def _write_buffer(uvf, firstVis, numVisBuff, lrec):
 
     """
     # Update descriptor
-    desc = uvf.Desc.Dict
-    desc.update(numVisBuff=numVisBuff)
-    uvf.Desc.Dict = desc
+    uvf.set_numvisbuff(numVisBuff)
 
     nbytes = numVisBuff * lrec * np.dtype(np.float32).itemsize
     log.debug("Writing '%s' visibilities. firstVis=%s numVisBuff=%s",
@@ -53,6 +62,80 @@ def _write_buffer(uvf, firstVis, numVisBuff, lrec):
     return firstVis + numVisBuff, 0
 
 
+@functools.lru_cache(maxsize=16)
+def _record_packer(nrparm, lrec, ilocu, ilocv, ilocw, iloct, ilocb, ilocsu):
+    """
+    Creates a numba kernel packing random parameters and
+    visibilities into AIPS UV records.
+
+    numba treats closure variables as compile-time constants,
+    so the record layout is baked into the compiled kernel.
+    Kernels are cached on the layout, so that exports
+    sharing a layout only compile the kernel once.
+
+    Parameters
+    ----------
+    nrparm : integer
+        Number of random parameters
+    lrec : integer
+        Length of a visibility record
+    ilocu, ilocv, ilocw, iloct, ilocb, ilocsu : integer
+        Random parameter indices
+
+    Returns
+    -------
+    callable
+        :code:`pack(records, vis_start, u, v, w, time, baselines, source_id, vis)`
+    """
+    nflat = lrec - nrparm
+
+    @numba.jit(nopython=True, parallel=True)
+    def _pack_records(records, vis_start, u, v, w, time, baselines, source_id, vis):
+        """
+        Pack random parameters and visibilities into AIPS UV records.
+
+        Parameters
+        ----------
+        records : np.ndarray
+            Records to fill. Shape: (nrecords, lrec)
+        vis_start : integer
+            Index of the (time, baseline) pair, in (ntime*nbl)
+            order, packed into the first record.
+        u, v, w : np.ndarray
+            AIPS UVW coordinates. Shape: (ntime, nbl)
+        time : np.ndarray
+            AIPS timestamps. Shape: (ntime,)
+        baselines : np.ndarray
+            AIPS baseline ids. Shape: (nbl,)
+        source_id : integer
+            AIPS source id
+        vis : np.ndarray
+            Flattened AIPS visibilities of each (time, baseline) pair.
+            Shape: (ntime*nbl, lrec - nrparm)
+        """
+        nbl = baselines.shape[0]
+
+        for r in numba.prange(records.shape[0]):
+            vi = vis_start + r
+            t = vi // nbl
+            bl = vi - t * nbl
+            record = records[r]
+
+            # Write random parameters
+            record[ilocu] = u[t, bl]          # U
+            record[ilocv] = v[t, bl]          # V
+            record[ilocw] = w[t, bl]          # W
+            record[iloct] = time[t]           # time
+            record[ilocb] = baselines[bl]     # baseline id
+            record[ilocsu] = source_id        # source id
+
+            # Write visibilities
+            for i in range(nflat):
+                record[nrparm + i] = vis[vi, i]
+
+    return _pack_records
+
+
 def uv_history_obs_description(kat_adapter, uvf):
     """
     Record MeerKAT observation metadata in AIPS history
@@ -131,8 +214,25 @@ def uv_export(kat_adapter, uvf, time_step=4):
     ilocb = desc['ilocb']     # baseline id
     ilocsu = desc['ilocsu']   # source id
 
-    # NX table rows
-    nx_rows = []
+    # Record packer specialised on the record layout,
+    # compiled on the first export with this layout
+    pack_records = _record_packer(nrparm, lrec, ilocu, ilocv, ilocw,
+                                  iloct, ilocb, ilocsu)
+
+    # View the Obit visibility buffer as (nvispio, lrec) records,
+    # so that data is written directly into the buffer
+    # that Obit writes to disk. Every record is fully
+    # overwritten before a write, so the buffer is not cleared.
+    vis_buffer = np.frombuffer(uvf.VisBuf, count=nvispio*lrec,
+                               dtype=np.float32).reshape(nvispio, lrec)
+
+    log.debug("Writing '%d' visibilities per IO operation "
+              "from a '%s' visibility buffer",
+              nvispio, fmt_bytes(vis_buffer.nbytes))
+
+    # NX table rows, one per scan
+    nx_rows = np.zeros(len(kat_adapter.scan_indices), dtype=NX_ROW_DTYPE)
+    nscans = 0
 
     # Iterate through kat adapter UV scans, writing their data to disk
     for si, state, aips_source, data_gen in time_chunked_scans(kat_adapter, time_step):
@@ -157,54 +257,50 @@ def uv_export(kat_adapter, uvf, time_step=4):
 
         # Retrieve observational data from the data generator
         for u, v, w, time, baselines, vis in data_gen:
-            vis_buffer = np.frombuffer(uvf.VisBuf, count=-1, dtype=np.float32)
-
             ntime, nbl = u.shape
+            nvis = ntime * nbl
+
+            # Flatten visibility data of each (time, baseline) pair
+            vis = vis.reshape(nvis, -1)
 
-            for t in range(ntime):
-                for bl in range(nbl):
-                    # Index within vis_buffer
-                    idx = numVisBuff * lrec
+            # Index of the next (time, baseline) pair to pack
+            vis_idx = 0
 
-                    # Write random parameters
-                    vis_buffer[idx + ilocu] = u[t, bl]          # U
-                    vis_buffer[idx + ilocv] = v[t, bl]          # V
-                    vis_buffer[idx + ilocw] = w[t, bl]          # W
-                    vis_buffer[idx + iloct] = time[t]           # time
-                    vis_buffer[idx + ilocb] = baselines[bl]     # baseline id
-                    vis_buffer[idx + ilocsu] = source_id        # source id
+            while vis_idx < nvis:
+                # Fill as much of the buffer as possible
+                n = min(nvis - vis_idx, nvispio - numVisBuff)
 
-                    # Flatten visibilities for buffer write
-                    flat_vis = vis[t, bl].ravel()
-                    vis_idx = idx + nrparm
-                    vis_buffer[vis_idx:vis_idx + flat_vis.size] = flat_vis
+                pack_records(vis_buffer[numVisBuff:numVisBuff + n], vis_idx,
+                             u, v, w, time, baselines, source_id, vis)
 
-                    numVisBuff += 1
+                numVisBuff += n
+                vis_idx += n
 
-                    # Hit the limit, write
-                    if numVisBuff == nvispio:
-                        firstVis, numVisBuff = _write_buffer(
-                            uvf, firstVis, numVisBuff, lrec)
+                # Hit the limit, write
+                if numVisBuff == nvispio:
+                    firstVis, numVisBuff = _write_buffer(
+                        uvf, firstVis, numVisBuff, lrec)
 
         # Write out any remaining visibilities
         if numVisBuff > 0:
             firstVis, numVisBuff = _write_buffer(uvf, firstVis, numVisBuff, lrec)
 
         # Create an index for this scan
-        nx_rows.append({
-            'TIME': [(scan_start + scan_end) / 2],  # Time Centroid
-            'TIME INTERVAL': [scan_end - scan_start],
-            'SOURCE ID': [source_id],
-            # Should match 'AIPS AN' table version
-            # Each AN table defines a subarray
-            'SUBARRAY': [1],
-            'FREQ ID': [1],            # Should match 'AIPS FQ' row FRQSEL
-            'START VIS': [start_vis],  # FORTRAN indexing
-            'END VIS': [firstVis - 1]  # FORTRAN indexing
-        })
+        nx_row = nx_rows[nscans]
+        nx_row['TIME'] = (scan_start + scan_end) / 2  # Time Centroid
+        nx_row['TIME INTERVAL'] = scan_end - scan_start
+        nx_row['SOURCE ID'] = source_id
+        # Should match 'AIPS AN' table version
+        # Each AN table defines a subarray
+        nx_row['SUBARRAY'] = 1
+        nx_row['FREQ ID'] = 1              # Should match 'AIPS FQ' row FRQSEL
+        nx_row['START VIS'] = start_vis    # FORTRAN indexing
+        nx_row['END VIS'] = firstVis - 1   # FORTRAN indexing
+        nscans += 1
 
     # Create the index and calibration tables
     uvf.attach_table("AIPS NX", 1)
-    uvf.tables["AIPS NX"].rows = nx_rows
+    uvf.tables["AIPS NX"].rows = [{k: [row[k].item()] for k in NX_ROW_DTYPE.names}
+                                  for row in nx_rows[:nscans]]
     uvf.tables["AIPS NX"].write()
     uvf.attach_CL_from_NX_table(kat_adapter.max_antenna_number)
@@ -294,6 +294,9 @@ class UVFacade(object):
 
         self._tables["AIPS HI"] = AIPSHistory(uv, err)
 
+        # numVisBuff last set on the descriptor by set_numvisbuff
+        self._numVisBuff = None
+
     def close(self):
         """ Closes the wrapped UV file """
 
@@ -357,6 +360,8 @@ class UVFacade(object):
         except AttributeError:
             pass
 
+        self._numVisBuff = None
+
     def __enter__(self):
         return self
 
@@ -396,6 +401,8 @@ class UVFacade(object):
 
     @property
     def Desc(self):
+        # Callers may modify numVisBuff through the descriptor
+        self._numVisBuff = None
         return self.uv.Desc
 
     @property
@@ -431,9 +438,43 @@ class UVFacade(object):
     def np_visbuf(self):
         return np.frombuffer(self.uv.VisBuf, count=-1, dtype=np.float32)
 
+    def set_numvisbuff(self, numVisBuff):
+        """
+        Set the number of visibilities in the buffer for the
+        next :meth:`Write`.
+
+        Setting the descriptor requires a round trip of the
+        entire :code:`uv.Desc.Dict`, so this is skipped if
+        ``numVisBuff`` was the last value set.
+
+        This relies on Obit's UV write taking the number of
+        visibilities to write from ``numVisBuff`` without
+        changing it, so consecutive writes of equally sized
+        buffers leave it intact. Obit does change ``numVisBuff``
+        when a file is opened, read or closed. The remembered value
+        is therefore forgotten on :meth:`Open`, :meth:`Read`,
+        :meth:`close` and :meth:`update_descriptor`, and whenever
+        the descriptor is accessed through :attr:`Desc`.
+
+        Parameters
+        ----------
+        numVisBuff: integer
+            Number of visibilities in the buffer
+        """
+        if numVisBuff == self._numVisBuff:
+            return
+
+        desc = self.uv.Desc.Dict
+        desc['numVisBuff'] = numVisBuff
+        self.uv.Desc.Dict = desc
+        self._numVisBuff = numVisBuff
+
     def Open(self, mode):
         err_msg = "Error opening UV file '%s'" % self.name
 
+        # Opening resets the descriptor
+        self._numVisBuff = None
+
         try:
             self.uv.Open(mode, self._err)
         except Exception:
@@ -465,6 +506,9 @@ class UVFacade(object):
             nvispio = self.uv.List.Dict['nVisPIO'][2][0]
             firstVis = firstVis - (nvispio-1)
 
+        # Reads update numVisBuff on the descriptor
+        self._numVisBuff = None
+
         try:
             self.uv.Read(self._err, firstVis=firstVis)
         except Exception:
@@ -508,6 +552,7 @@ class UVFacade(object):
         desc = uv.Desc.Dict
         desc.update(descriptor)
         uv.Desc.Dict = desc
+        self._numVisBuff = None
 
         err_msg = "Error updating descriptor on UV file '%s'" % self.name
 